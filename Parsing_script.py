@@ -9,86 +9,182 @@ graceful error handling.
 Features:
 - Supports multiple formats: .txt, .csv, .json, .xml, .pdf, .docx, .xlsx, .xls, .html, .htm
 - Detects format based on file extension.
-- Conditional library imports with warnings if dependencies are missing.
+- Optional libraries are imported lazily on first use; parsers log an error if theirs is missing.
 - Basic text extraction for complex formats (PDF, DOCX, HTML, XML).
-- Structured data loading for CSV, JSON, Excel.
+- Structured data loading for CSV, JSON, Excel (XLSX rows can be streamed lazily).
 - Error handling for file not found, decoding errors, and parsing issues.
 - Returns parsed content in a format-appropriate Python object (string, list, dict).
+- Concurrent batch parsing of many files via parse_documents().
 
 Limitations:
-- Encoding: Assumes UTF-8 by default for text files. May fail on files with
-  different encodings. Consider using libraries like 'chardet' for auto-detection
-  in more advanced scenarios.
-- PDF Complexity: Text extraction via PyPDF2 works best on text-based PDFs.
+- Encoding: Text files (TXT, CSV, HTML) are assumed to be UTF-8 unless
+  'charset-normalizer' is installed, in which case other encodings are detected
+  from the first 64 KiB. JSON is always read as UTF-8; XML honours its declaration.
+- PDF Complexity: Text extraction via pypdfium2/PyPDF2 works best on text-based PDFs.
   Scanned PDFs (images) require OCR (e.g., pytesseract). Complex layouts might
   result in imperfect text ordering.
 - DOCX/XLSX Features: Primarily extracts text. Does not parse complex formatting,
-  macros, images, or embedded objects. Pandas reads full Excel sheets into memory,
-  which might be an issue for extremely large files.
+  macros, images, or embedded objects. XLSX is streamed with openpyxl in read-only
+  mode; legacy .xls is read fully into memory by pandas.
 - Structured Data: XML/HTML text extraction is basic. For specific data extraction,
   use targeted XPath (XML) or CSS selectors/tag navigation (HTML).
+- PDF Worker Processes: PDFs with many pages are extracted in a 'spawn' process pool,
+  which re-imports the calling script; guard its entry point with
+  `if __name__ == "__main__":` (or pass min_pages_for_parallel=None to parse_pdf).
 - CSV Dialects: Assumes standard comma-separated values. Use `csv.Sniffer` or
   pass specific `delimiter`, `quotechar` arguments for non-standard CSVs.
 
 External Library Installation:
 ------------------------------
-pip install PyPDF2 python-docx pandas openpyxl xlrd beautifulsoup4 lxml
+pip install pypdfium2 lxml pandas openpyxl xlrd selectolax
+(PyPDF2 and python-docx are also accepted as fallback PDF/DOCX backends; lxml doubles as the HTML fallback.)
+
+Optional (faster parsing):
+pip install orjson pysimdjson pyarrow numpy charset-normalizer python-calamine
 """
 
 import os
+import re
+import stat
 import csv
 import json
 import xml.etree.ElementTree as ET
-import sys
 import logging
-import pprint # For pretty printing JSON/Dicts
+import codecs
+import collections
+import contextlib
+import functools
+import importlib
+import zipfile
+import concurrent.futures
+import multiprocessing
+from itertools import repeat
+import threading
 
 # --- Setup Logging ---
 # Using logging is better than print for errors/info in reusable scripts
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
-# --- Check and Import External Libraries ---
-# Suppress info messages during import checks
-original_level = logging.getLogger().getEffectiveLevel()
-logging.getLogger().setLevel(logging.WARNING)
-
-# PyPDF2 for PDF
-try:
-    import PyPDF2
-    HAS_PYPDF2 = True
-except ImportError:
-    HAS_PYPDF2 = False
-    logging.warning("PyPDF2 not found. PDF parsing disabled. Install with: pip install PyPDF2")
-
-# python-docx for DOCX
-try:
-    import docx
-    HAS_DOCX = True
-except ImportError:
-    HAS_DOCX = False
-    logging.warning("python-docx not found. DOCX parsing disabled. Install with: pip install python-docx")
-
-# pandas, openpyxl, xlrd for Excel
-try:
-    import pandas as pd
-    import openpyxl # Needed by pandas for .xlsx
-    import xlrd     # Needed by pandas for older .xls
-    HAS_PANDAS = True
-except ImportError:
-    HAS_PANDAS = False
-    logging.warning("pandas, openpyxl, or xlrd not found. Excel parsing disabled. Install with: pip install pandas openpyxl xlrd")
-
-# BeautifulSoup4 and lxml for HTML
-try:
-    from bs4 import BeautifulSoup
-    import lxml # Recommended parser for BeautifulSoup
-    HAS_BS4 = True
-except ImportError:
-    HAS_BS4 = False
-    logging.warning("beautifulsoup4 or lxml not found. HTML parsing disabled. Install with: pip install beautifulsoup4 lxml")
-
-# Restore original logging level
-logging.getLogger().setLevel(original_level)
+# --- Optional External Libraries ---
+# Third-party libraries are imported on first use instead of at module load, so startup
+# stays fast and only the formats actually parsed pay for their imports. Parsers log an
+# error with install instructions when a required library turns out to be missing.
+#
+#   PDF:   pypdfium2 (preferred) or PyPDF2
+#   DOCX:  lxml (preferred) or python-docx
+#   XLSX:  openpyxl            XLS:  pandas + python-calamine (preferred) or xlrd
+#   HTML:  selectolax (preferred) or lxml
+#   XML:   lxml (optional; falls back to xml.etree.ElementTree)
+#   JSON:  orjson or pysimdjson (optional; falls back to json)
+#   CSV:   pyarrow, pandas, numpy (optional fast paths)
+#   Text:  charset-normalizer (optional encoding detection)
+
+@functools.lru_cache(maxsize=None)
+def _optional_import(module_name):
+    """
+    Imports an optional dependency once. Returns the module, or None if it is not installed.
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+_simdjson_local = threading.local()
+
+def _simdjson_parser():
+    """
+    Returns this thread's pysimdjson Parser (reused to keep its buffers warm), or None if
+    pysimdjson is not installed. Parsers are not thread-safe, hence one per thread.
+    """
+    parser = getattr(_simdjson_local, 'parser', None)
+    if parser is None:
+        simdjson = _optional_import('simdjson')
+        if simdjson is None:
+            return None
+        parser = _simdjson_local.parser = simdjson.Parser()
+    return parser
+
+_WORDML_NS = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+
+@functools.lru_cache(maxsize=None)
+def _docx_xpaths():
+    """
+    Compiles the DOCX paragraph and run-content XPath expressions once, on first use.
+    Like python-docx, only the paragraph's own runs (direct or inside w:hyperlink) are read,
+    so text boxes and mc:AlternateContent branches nested in a run don't leak into the paragraph.
+    Page and column breaks are skipped; only text-wrapping breaks match.
+    """
+    etree = _optional_import('lxml.etree')
+    content = ("w:t", "w:tab", "w:ptab", "w:cr", "w:noBreakHyphen",
+               "w:br[not(@w:type) or @w:type='textWrapping']")
+    run_content = "|".join(f"{run}/{child}" for run in ("./w:r", "./w:hyperlink/w:r") for child in content)
+    return (etree.XPath('/w:document/w:body/w:p', namespaces=_WORDML_NS),
+            etree.XPath(run_content, namespaces=_WORDML_NS))
+
+# Text equivalents of the non-w:t run content matched by _docx_xpaths(), as in python-docx
+_DOCX_RUN_SYMBOLS = {f"{{{_WORDML_NS['w']}}}{tag}": text for tag, text in
+                     (("tab", "\t"), ("ptab", "\t"), ("cr", "\n"), ("br", "\n"), ("noBreakHyphen", "-"))}
+
+@functools.lru_cache(maxsize=None)
+def _lxml_html_tools():
+    """
+    Builds the lxml HTML parser and script/style XPath once, on first use.
+    """
+    etree = _optional_import('lxml.etree')
+    html = _optional_import('lxml.html')
+    return html.HTMLParser(encoding='utf-8'), etree.XPath('//script|//style')
+
+
+# --- File Reading Helpers ---
+
+def _read_bytes(filepath):
+    """
+    Reads a whole file as bytes in one call (a single read sized from fstat).
+    Raises FileNotFoundError/IOError like open().
+    """
+    with open(filepath, 'rb') as f:
+        return f.read()
+
+_ENCODING_SNIFF_SIZE = 64 * 1024 # Bytes sampled from the start of a file for encoding detection
+
+def _detect_encoding_from_bytes(data):
+    """
+    Guesses the text encoding of a byte sample. Valid UTF-8 (including a multi-byte
+    character cut off at the end of the sample) short-circuits to 'utf-8'; otherwise
+    charset-normalizer is consulted if installed. Returns a Python codec name.
+    """
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(data, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    charset_normalizer = _optional_import('charset_normalizer')
+    if charset_normalizer is not None:
+        best = charset_normalizer.from_bytes(data).best()
+        if best is not None:
+            return codecs.lookup(best.encoding).name
+    return 'utf-8'
+
+def _read_text(filepath):
+    """
+    Reads a whole file and decodes it once with its detected encoding.
+    Undecodable bytes are replaced with U+FFFD rather than triggering a second read.
+    """
+    data = _read_bytes(filepath)
+    return data.decode(_detect_encoding_from_bytes(data[:_ENCODING_SNIFF_SIZE]), errors='replace')
+
+@functools.lru_cache(maxsize=256)
+def _detect_encoding_cached(abspath, mtime_ns, size, sniff):
+    with open(abspath, 'rb') as f:
+        return _detect_encoding_from_bytes(f.read(sniff))
+
+def _detect_encoding(filepath, sniff=_ENCODING_SNIFF_SIZE):
+    """
+    Detects a file's text encoding from its first `sniff` bytes.
+    Results are cached per (path, mtime, size), so repeated opens of the same file sniff once.
+    """
+    st = os.stat(filepath)
+    return _detect_encoding_cached(os.path.abspath(filepath), st.st_mtime_ns, st.st_size, sniff)
 
 
 # --- Parsing Functions ---
@@ -99,14 +195,10 @@ def parse_txt(filepath):
     Returns the file content as a single string, or None on error.
     """
     try:
-        # Try UTF-8 first, then fall back to system default if it fails
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            logging.warning(f"UTF-8 decoding failed for {filepath}. Trying system default encoding.")
-            with open(filepath, 'r', encoding=sys.getdefaultencoding(), errors='ignore') as f:
-                content = f.read()
+        content = _read_text(filepath)
+        # Match text-mode open(): normalize line endings to '\n'
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
         logging.info(f"Successfully parsed TXT: {os.path.basename(filepath)}")
         # Optionally print snippet
         # print(f"--- Content Snippet of {os.path.basename(filepath)} ---")
@@ -120,19 +212,105 @@ def parse_txt(filepath):
         logging.error(f"Unexpected error parsing TXT file {filepath}: {e}")
     return None
 
-def parse_csv(filepath):
+@contextlib.contextmanager
+def _open_csv_reader(filepath):
+    """
+    Opens a CSV file in its detected encoding and yields a csv.reader over it.
+    csv.Error raised while reading is re-raised with the offending line number.
+    """
+    with open(filepath, 'r', encoding=_detect_encoding(filepath), newline='') as f:
+        # Consider using csv.Sniffer().sniff(f.read(1024)) for dialect detection
+        # f.seek(0) # Reset file pointer after sniffing
+        reader = csv.reader(f)
+        try:
+            yield reader
+        except csv.Error as e:
+            raise csv.Error(f"line {reader.line_num}: {e}") from e
+
+def parse_csv_iter(filepath):
+    """
+    Lazily iterates over the rows of a CSV file (.csv), yielding one list per row.
+    Assumes comma delimiter and standard quoting. Errors propagate to the caller.
+    """
+    with _open_csv_reader(filepath) as reader:
+        yield from reader
+
+def _sniff_numeric_csv(filepath, sample_size=1024):
+    """
+    Guesses from the first sample_size characters whether a CSV holds only numbers.
+    Returns (is_numeric, has_header).
+    """
+    with open(filepath, 'r', encoding=_detect_encoding(filepath), newline='') as f:
+        sample = f.read(sample_size)
+    if not sample:
+        return False, False
+    try:
+        has_header = csv.Sniffer().has_header(sample)
+    except csv.Error:
+        has_header = False
+    rows = list(csv.reader(sample.splitlines()[:2]))
+    data_row = rows[1] if has_header and len(rows) > 1 else (rows[0] if rows and not has_header else None)
+    if not data_row:
+        return False, has_header
+    try:
+        for cell in data_row:
+            float(cell)
+    except ValueError:
+        return False, has_header
+    return True, has_header
+
+def _read_numeric_csv(filepath, has_header):
+    """
+    Reads an all-numeric CSV into a typed container, skipping per-cell str objects.
+    Returns a pandas DataFrame (pyarrow) or numpy array, or None if neither backend is installed.
+    """
+    pa_csv = _optional_import('pyarrow.csv')
+    if pa_csv is not None and _optional_import('pandas') is not None:
+        read_options = pa_csv.ReadOptions(autogenerate_column_names=not has_header)
+        return pa_csv.read_csv(filepath, read_options=read_options).to_pandas()
+    np = _optional_import('numpy')
+    if np is not None:
+        return np.loadtxt(filepath, delimiter=',', skiprows=1 if has_header else 0, ndmin=2)
+    logging.warning("pyarrow + pandas or numpy required for numeric CSV parsing. Returning rows as strings.")
+    return None
+
+def parse_csv(filepath, engine='python', numeric=False):
     """
     Parses a CSV file (.csv). Assumes comma delimiter and standard quoting.
-    Returns a list of lists (header + data rows), or None on error.
+    engine='pyarrow' uses pyarrow's multithreaded reader if installed (cell values are type-inferred).
+    numeric=True reads an all-numeric CSV into a pandas DataFrame (via pyarrow) or numpy array
+    (header row skipped); numeric='auto' does so only if a sample of the file looks numeric.
+    Returns a list of lists (header + data rows), the numeric container above, or None on error.
     """
+    pa_csv = _optional_import('pyarrow.csv') if engine == 'pyarrow' else None
+    if engine == 'pyarrow' and pa_csv is None:
+        logging.warning("pyarrow not found. Falling back to the csv module. Install with: pip install pyarrow")
+        engine = 'python'
     try:
-        rows = []
-        with open(filepath, 'r', encoding='utf-8', newline='') as f:
-            # Consider using csv.Sniffer().sniff(f.read(1024)) for dialect detection
-            # f.seek(0) # Reset file pointer after sniffing
-            reader = csv.reader(f)
-            for row in reader:
-                rows.append(row)
+        has_header = True
+        if numeric == 'auto':
+            numeric, has_header = _sniff_numeric_csv(filepath)
+        if numeric:
+            numeric_data = _read_numeric_csv(filepath, has_header)
+            if numeric_data is not None:
+                logging.info(f"Successfully parsed numeric CSV: {os.path.basename(filepath)} ({len(numeric_data)} rows)")
+                return numeric_data
+        if engine == 'pyarrow':
+            try:
+                table = pa_csv.read_csv(filepath)
+            except _optional_import('pyarrow').ArrowInvalid as e:
+                # Empty files (or a lone header without newline) can't be typed by pyarrow;
+                # let the csv module handle them so both engines agree ([] for empty files)
+                if 'Empty CSV file' not in str(e):
+                    raise
+                engine = 'python'
+            else:
+                # Build rows column-wise; per-row dicts would collapse duplicate column names
+                rows = [table.column_names] + [list(row) for row in zip(*(column.to_pylist() for column in table.columns))]
+        if engine != 'pyarrow':
+            # list(reader) fills the list in C; no per-row generator or append overhead
+            with _open_csv_reader(filepath) as reader:
+                rows = list(reader)
         logging.info(f"Successfully parsed CSV: {os.path.basename(filepath)} ({len(rows)} rows)")
         # Optionally print snippet
         # print(f"--- Header and first 5 data rows of {os.path.basename(filepath)} ---")
@@ -146,29 +324,50 @@ def parse_csv(filepath):
     except FileNotFoundError:
         logging.error(f"File not found: {filepath}")
     except csv.Error as e:
-        logging.error(f"CSV parsing error in file {filepath}, line {reader.line_num}: {e}")
+        logging.error(f"CSV parsing error in file {filepath}, {e}")
     except IOError as e:
         logging.error(f"IOError reading CSV file {filepath}: {e}")
     except Exception as e:
         logging.error(f"Unexpected error parsing CSV file {filepath}: {e}")
     return None
 
-def parse_json(filepath):
+# 20+ consecutive digits may be an integer wider than 64 bits, which the native parsers
+# can't represent exactly; false positives (e.g. inside strings) only skip the fast path
+_WIDE_INT_RE = re.compile(rb'\d{20}')
+
+def parse_json(filepath, native=True):
     """
-    Parses a JSON file (.json).
+    Parses a JSON file (.json). Uses orjson or pysimdjson when available (native=True), else stdlib json.
+    Input the native backends reject (e.g. NaN/Infinity literals), or that may hold integers wider
+    than 64 bits, is parsed with stdlib json so such integers stay exact.
     Returns the parsed Python object (dict or list), or None on error.
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        raw = _read_bytes(filepath) # All backends accept UTF-8 bytes directly
+        native = native and _WIDE_INT_RE.search(raw) is None
+        orjson = _optional_import('orjson') if native else None
+        simdjson_parser = _simdjson_parser() if native and orjson is None else None
+        data = None
+        parsed = False
+        if orjson is not None or simdjson_parser is not None:
+            try:
+                if orjson is not None:
+                    data = orjson.loads(raw)
+                else:
+                    data = simdjson_parser.parse(raw, recursive=True)
+                parsed = True
+            except ValueError: # orjson.JSONDecodeError / pysimdjson errors
+                logging.debug(f"Native JSON parser rejected {filepath}; retrying with stdlib json.")
+        if not parsed:
+            data = json.loads(raw)
         logging.info(f"Successfully parsed JSON: {os.path.basename(filepath)}")
         # Optionally print snippet
         # print(f"--- Parsed JSON data from {os.path.basename(filepath)} ---")
-        # pprint.pprint(data)
+        # print(json.dumps(data, indent=2, default=str))
         return data
     except FileNotFoundError:
         logging.error(f"File not found: {filepath}")
-    except json.JSONDecodeError as e:
+    except ValueError as e: # JSONDecodeError (json/orjson) and pysimdjson errors are ValueErrors
          logging.error(f"Invalid JSON format in {filepath}: {e}")
     except IOError as e:
         logging.error(f"IOError reading JSON file {filepath}: {e}")
@@ -176,17 +375,50 @@ def parse_json(filepath):
         logging.error(f"Unexpected error parsing JSON file {filepath}: {e}")
     return None
 
+def _iter_xml_text_lxml(filepath):
+    """
+    Streams an XML file with lxml's iterparse, yielding stripped element text in document order.
+    Processed elements are cleared as parsing proceeds, so the tree never grows; the collected
+    text (plus a slot per element that still has text after it) is what stays in memory.
+    Comments and PIs are dropped like ElementTree does, so text after a comment stays in elem.text.
+    """
+    parts = [] # Slot per element, reserved on 'start' so text keeps document order
+    open_slots = []
+    etree = _optional_import('lxml.etree')
+    for event, elem in etree.iterparse(filepath, events=('start', 'end'), huge_tree=False, recover=True,
+                                       remove_comments=True, remove_pis=True):
+        if event == 'start':
+            open_slots.append(len(parts))
+            parts.append(None)
+            continue
+        slot = open_slots.pop()
+        text = elem.text.strip() if elem.text else ""
+        if text:
+            parts[slot] = text
+        elif slot == len(parts) - 1:
+            parts.pop() # Nothing was recorded after this element; release its empty slot
+        elem.clear(keep_tail=True)
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    return (part for part in parts if part)
+
 def parse_xml(filepath):
     """
     Parses an XML file (.xml) and extracts all text content.
+    Uses lxml's streaming iterparse when available, else xml.etree.ElementTree.
     Returns the concatenated text as a single string, or None on error.
     """
+    etree = _optional_import('lxml.etree')
+    parse_errors = (ET.ParseError,) if etree is None else (ET.ParseError, etree.XMLSyntaxError)
     try:
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        # Extract text content from all elements
-        text_parts = [elem.text for elem in root.iter() if elem.text]
-        text_content = ' '.join(part.strip() for part in text_parts if part.strip())
+        if etree is not None:
+            text_content = ' '.join(_iter_xml_text_lxml(filepath))
+        else:
+            tree = ET.parse(filepath)
+            root = tree.getroot()
+            # Extract text content from all elements, stripping each piece once
+            stripped = (elem.text.strip() for elem in root.iter() if elem.text)
+            text_content = ' '.join(part for part in stripped if part)
         logging.info(f"Successfully parsed XML and extracted text: {os.path.basename(filepath)}")
         # Optionally print snippet
         # print(f"--- Extracted Text from {os.path.basename(filepath)} ---")
@@ -194,7 +426,7 @@ def parse_xml(filepath):
         return text_content
     except FileNotFoundError:
         logging.error(f"File not found: {filepath}")
-    except ET.ParseError as e:
+    except parse_errors as e:
         logging.error(f"XML parsing error in {filepath}: {e}")
     except IOError as e:
         logging.error(f"IOError reading XML file {filepath}: {e}")
@@ -202,121 +434,342 @@ def parse_xml(filepath):
         logging.error(f"Unexpected error processing XML file {filepath}: {e}")
     return None
 
-def parse_pdf(filepath):
+# PDFium is not thread-safe, even across separate documents; every pypdfium2 call in this
+# process (e.g. from parse_documents' thread pool) is serialized through this lock
+_PDFIUM_LOCK = threading.Lock()
+
+def _open_pdf(filepath):
+    """
+    Opens a PDF with the preferred available backend (pypdfium2, else PyPDF2).
+    """
+    pdfium = _optional_import('pypdfium2')
+    if pdfium is not None:
+        with _PDFIUM_LOCK:
+            return pdfium.PdfDocument(filepath)
+    return _optional_import('PyPDF2').PdfReader(filepath)
+
+def _close_pdf(pdf):
     """
-    Parses a PDF file (.pdf) and extracts text using PyPDF2.
+    Releases a document returned by _open_pdf. PyPDF2 readers hold no native resources.
+    """
+    if _optional_import('pypdfium2') is not None:
+        with _PDFIUM_LOCK:
+            pdf.close()
+
+def _pdf_page_count(pdf):
+    if _optional_import('pypdfium2') is not None:
+        with _PDFIUM_LOCK:
+            return len(pdf)
+    return len(pdf.pages)
+
+def _pdf_page_text(pdf, filepath, page_num):
+    """
+    Extracts the text of one page. Returns an empty string if the page fails.
+    """
+    try:
+        if _optional_import('pypdfium2') is not None:
+            with _PDFIUM_LOCK:
+                page = pdf[page_num]
+                textpage = page.get_textpage()
+                try:
+                    # PDFium separates lines with \r\n; match PyPDF2's \n
+                    return textpage.get_text_range().replace('\r\n', '\n')
+                finally:
+                    textpage.close()
+                    page.close()
+        return pdf.pages[page_num].extract_text() or ""
+    except Exception as page_error:
+        # Log error for specific page but continue
+        logging.warning(f"Could not extract text from page {page_num + 1} in {filepath}: {page_error}")
+        return ""
+
+# (absolute filepath, mtime_ns, document) currently open in a pool worker process, reused across
+# consecutive pages of the same file and replaced when the worker moves to another file
+_WORKER_PDF = None
+
+def _extract_page(filepath, mtime_ns, page_num):
+    """
+    Process pool worker: extracts one page, keeping the current PDF open between pages.
+    filepath must be absolute; workers keep the working directory they were started in.
+    """
+    global _WORKER_PDF
+    if _WORKER_PDF is None or _WORKER_PDF[:2] != (filepath, mtime_ns):
+        if _WORKER_PDF is not None:
+            _close_pdf(_WORKER_PDF[2])
+            _WORKER_PDF = None
+        _WORKER_PDF = (filepath, mtime_ns, _open_pdf(filepath))
+    return _pdf_page_text(_WORKER_PDF[2], filepath, page_num)
+
+_PDF_POOL = None
+_PDF_POOL_LOCK = threading.Lock()
+
+def _pdf_process_pool():
+    """
+    Returns the process pool shared by every parse_pdf call, creating it on first use.
+    A single pool of cpu_count workers keeps concurrent large PDFs (e.g. under
+    parse_documents) from oversubscribing the CPU. Workers are started with 'spawn'
+    because forking a multi-threaded parent can deadlock the child.
+    """
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            _PDF_POOL = concurrent.futures.ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context('spawn'))
+        return _PDF_POOL
+
+def _discard_pdf_process_pool(pool):
+    """
+    Drops a broken pool so the next parse_pdf call starts a fresh one.
+    """
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is pool:
+            _PDF_POOL = None
+    pool.shutdown(wait=False)
+
+def parse_pdf(filepath, min_pages_for_parallel=8):
+    """
+    Parses a PDF file (.pdf) and extracts text using pypdfium2, falling back to PyPDF2.
+    PDFs with at least min_pages_for_parallel pages are split across a shared process pool.
+    Its workers are started with 'spawn', which re-imports the caller's main module, so scripts
+    must guard their entry point with `if __name__ == "__main__":`. Pass
+    min_pages_for_parallel=None to always extract in-process.
     Returns the extracted text as a single string, or None on error or if library missing.
     """
-    if not HAS_PYPDF2:
-        logging.error("PyPDF2 library is required for PDF parsing but not found.")
+    pdfium = _optional_import('pypdfium2')
+    PyPDF2 = _optional_import('PyPDF2')
+    if pdfium is None and PyPDF2 is None:
+        logging.error("pypdfium2 or PyPDF2 library is required for PDF parsing but not found. Install with: pip install pypdfium2")
         return None
+    read_errors = (pdfium.PdfiumError,) if pdfium is not None else (PyPDF2.errors.PdfReadError,)
     try:
-        text_content = ""
-        with open(filepath, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            num_pages = len(reader.pages)
+        pdf = _open_pdf(filepath)
+        try:
+            num_pages = _pdf_page_count(pdf)
             logging.info(f"Reading {num_pages} pages from PDF: {os.path.basename(filepath)}...")
-            for page_num in range(num_pages):
-                try:
-                    page = reader.pages[page_num]
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content += page_text + "\n" # Add newline between pages
-                except Exception as page_error:
-                    # Log error for specific page but continue
-                    logging.warning(f"Could not extract text from page {page_num + 1} in {filepath}: {page_error}")
+            parallel = min_pages_for_parallel is not None and num_pages >= min_pages_for_parallel
+            if not parallel:
+                page_texts = [_pdf_page_text(pdf, filepath, page_num) for page_num in range(num_pages)]
+        finally:
+            _close_pdf(pdf)
+        if parallel:
+            # Workers may be in another working directory than the caller by now
+            abspath = os.path.abspath(filepath)
+            mtime_ns = os.stat(abspath).st_mtime_ns # Lets workers tell a rewritten file from their open copy
+            pool = _pdf_process_pool()
+            try:
+                page_texts = list(pool.map(_extract_page, repeat(abspath), repeat(mtime_ns),
+                                           range(num_pages), chunksize=4))
+            except concurrent.futures.process.BrokenProcessPool:
+                _discard_pdf_process_pool(pool)
+                raise
+        # Newline between pages; join avoids quadratic string concatenation on large PDFs
+        text_content = "\n".join(page_text for page_text in page_texts if page_text).strip()
         logging.info(f"Finished extracting text from PDF: {os.path.basename(filepath)}")
         # Optionally print snippet
         # print(f"--- Extracted Text from {os.path.basename(filepath)} ---")
         # print(text_content[:500] + ('...' if len(text_content) > 500 else ''))
-        return text_content.strip()
+        return text_content
     except FileNotFoundError:
         logging.error(f"File not found: {filepath}")
-    except PyPDF2.errors.PdfReadError as e:
-        logging.error(f"PyPDF2 error reading PDF {filepath}: {e}")
+    except read_errors as e:
+        logging.error(f"Error reading PDF {filepath}: {e}")
     except IOError as e:
         logging.error(f"IOError reading PDF file {filepath}: {e}")
     except Exception as e:
         logging.error(f"Unexpected error parsing PDF file {filepath}: {e}")
     return None
 
+def _extract_docx_text_lxml(filepath):
+    """
+    Reads word/document.xml straight from the DOCX zip and joins the text of top-level body
+    paragraphs (same scope as python-docx's doc.paragraphs). Tabs, line breaks and non-breaking
+    hyphens map to '\t'/'\n'/'-'; page and column breaks are dropped.
+    Raises KeyError if the archive has no word/document.xml.
+    """
+    with zipfile.ZipFile(filepath) as z:
+        root = _optional_import('lxml.etree').fromstring(z.read('word/document.xml'))
+    body_paragraphs, run_content = _docx_xpaths()
+    w_t = f"{{{_WORDML_NS['w']}}}t"
+    paragraphs = []
+    for para in body_paragraphs(root):
+        pieces = []
+        for node in run_content(para):
+            if node.tag == w_t:
+                pieces.append(node.text or "")
+            else:
+                pieces.append(_DOCX_RUN_SYMBOLS[node.tag])
+        text = "".join(pieces)
+        if text:
+            paragraphs.append(text)
+    return "\n".join(paragraphs)
+
 def parse_docx(filepath):
     """
     Parses a Word document (.docx) and extracts text from paragraphs.
+    Reads the document XML directly with lxml when available, else uses python-docx.
     Returns the extracted text as a single string, or None on error or if library missing.
     """
-    if not HAS_DOCX:
-        logging.error("python-docx library is required for DOCX parsing but not found.")
+    has_lxml = _optional_import('lxml.etree') is not None
+    docx = _optional_import('docx')
+    if not has_lxml and docx is None:
+        logging.error("lxml or python-docx library is required for DOCX parsing but not found. Install with: pip install lxml")
         return None
     try:
-        doc = docx.Document(filepath)
-        text_content = "\n".join([para.text for para in doc.paragraphs if para.text])
+        text_content = None
+        if has_lxml:
+            try:
+                text_content = _extract_docx_text_lxml(filepath)
+            except KeyError:
+                if docx is None:
+                    raise
+                logging.warning(f"Unexpected DOCX layout in {filepath}. Falling back to python-docx.")
+        if text_content is None:
+            doc = docx.Document(filepath)
+            text_content = "\n".join([para.text for para in doc.paragraphs if para.text])
         logging.info(f"Successfully parsed DOCX: {os.path.basename(filepath)}")
         # Optionally print snippet
         # print(f"--- Extracted Text from {os.path.basename(filepath)} ---")
         # print(text_content[:500] + ('...' if len(text_content) > 500 else ''))
-        # TODO: Add table text extraction if needed:
+        # TODO: Add table text extraction if needed (python-docx example):
+        # table_lines = []
         # for table in doc.tables:
         #     for row in table.rows:
-        #         for cell in row.cells:
-        #             text_content += cell.text + "\t" # Example separator
-        #         text_content += "\n"
+        #         table_lines.append("\t".join(cell.text for cell in row.cells)) # Example separator
+        # text_content = "\n".join([text_content] + table_lines)
         return text_content
     except FileNotFoundError:
         logging.error(f"File not found: {filepath}")
-    except Exception as e: # Catches errors from python-docx (e.g., corrupted file)
+    except Exception as e: # Catches zip/XML/python-docx errors (e.g., corrupted file)
         logging.error(f"Error parsing DOCX file {filepath}: {e}")
     return None
 
-def parse_excel(filepath):
+def _iter_xlsx_rows(workbook):
     """
-    Parses an Excel file (.xlsx, .xls) using pandas. Reads all sheets.
-    Returns a dictionary mapping sheet names to pandas DataFrames, or None on error or if library missing.
-    Note: Can consume significant memory for large files.
+    Yields (sheet_name, row) pairs from a read-only openpyxl workbook, closing it when exhausted.
     """
-    if not HAS_PANDAS:
-        logging.error("pandas, openpyxl, xlrd libraries required for Excel parsing but not found.")
-        return None
     try:
-        # Determine the engine based on extension
-        engine = 'openpyxl' if filepath.lower().endswith('.xlsx') else 'xlrd'
-        excel_data = pd.read_excel(filepath, sheet_name=None, engine=engine)
+        for ws in workbook.worksheets:
+            for row in ws.iter_rows(values_only=True):
+                yield ws.title, list(row)
+    finally:
+        workbook.close()
+
+def _pandas_excel_engine(is_xlsx):
+    """
+    Picks the pandas read_excel engine: calamine (Rust, reads both formats) when
+    python-calamine is installed, else openpyxl (.xlsx) or xlrd (.xls). Returns None if none is available.
+    """
+    if _optional_import('python_calamine') is not None:
+        return 'calamine'
+    engine = 'openpyxl' if is_xlsx else 'xlrd'
+    return engine if _optional_import(engine) is not None else None
+
+def parse_excel(filepath, lazy=False, as_dataframes=False):
+    """
+    Parses an Excel file (.xlsx, .xls). Reads all sheets.
+    .xlsx is streamed with openpyxl in read-only mode; .xls (or any file with as_dataframes=True)
+    is loaded with pandas, using the calamine engine and pyarrow-backed dtypes when installed.
+    Returns a dictionary mapping sheet names to lists of rows (.xlsx) or pandas DataFrames,
+    or None on error or if library missing.
+    With lazy=True, .xlsx returns a generator of (sheet_name, row) pairs instead.
+    Note: files read with pandas are loaded fully into memory.
+    """
+    is_xlsx = filepath.lower().endswith('.xlsx')
+    use_pandas = as_dataframes or not is_xlsx
+    if use_pandas:
+        pd = _optional_import('pandas')
+        engine = _pandas_excel_engine(is_xlsx)
+        if pd is None or engine is None:
+            logging.error("pandas and python-calamine (or xlrd/openpyxl) libraries required for Excel DataFrame parsing but not found. Install with: pip install pandas python-calamine")
+            return None
+    else:
+        openpyxl = _optional_import('openpyxl')
+        if openpyxl is None:
+            logging.error("openpyxl library required for XLSX parsing but not found. Install with: pip install openpyxl")
+            return None
+    try:
+        if use_pandas:
+            if lazy:
+                logging.warning(f"Lazy reading is not supported for DataFrames; loading {filepath} fully.")
+            # Arrow-backed columns are more compact than object dtype; needs pandas >= 2.0
+            read_kwargs = {'dtype_backend': 'pyarrow'} if _optional_import('pyarrow') is not None else {}
+            try:
+                excel_data = pd.read_excel(filepath, sheet_name=None, engine=engine, **read_kwargs)
+            except (ValueError, TypeError) as e:
+                # Older pandas rejects engine='calamine' (< 2.2) or dtype_backend (< 2.0);
+                # retry with the classic engine and default dtypes
+                fallback_engine = 'openpyxl' if is_xlsx else 'xlrd'
+                if _optional_import(fallback_engine) is None:
+                    fallback_engine = engine
+                if fallback_engine == engine and not read_kwargs:
+                    raise
+                logging.warning(f"pandas read_excel failed with engine={engine!r} {read_kwargs}: {e}; retrying with engine={fallback_engine!r}")
+                excel_data = pd.read_excel(filepath, sheet_name=None, engine=fallback_engine)
+        else:
+            workbook = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+            if lazy:
+                logging.info(f"Streaming Excel rows lazily: {os.path.basename(filepath)}")
+                return _iter_xlsx_rows(workbook)
+            excel_data = {ws.title: [] for ws in workbook.worksheets} # Keep empty sheets
+            for sheet_name, row in _iter_xlsx_rows(workbook):
+                excel_data[sheet_name].append(row)
         logging.info(f"Successfully parsed Excel: {os.path.basename(filepath)} ({len(excel_data)} sheets)")
         # Optionally print snippets
         # print(f"--- Content Snippets from {os.path.basename(filepath)} ---")
-        # for sheet_name, df in excel_data.items():
+        # for sheet_name, rows in excel_data.items():
         #     print(f"\n=== Sheet: {sheet_name} (first 5 rows) ===")
-        #     print(df.head().to_string())
+        #     for row in rows[:5]:
+        #         print(row)
         return excel_data
     except FileNotFoundError:
         logging.error(f"File not found: {filepath}")
-    except (KeyError, ValueError, ImportError) as e: # Catch pandas/engine errors
+    except (KeyError, ValueError, ImportError) as e: # Catch openpyxl/pandas/engine errors
         logging.error(f"Error parsing Excel file {filepath} (check file/libraries): {e}")
     except MemoryError:
-        logging.error(f"MemoryError parsing Excel file {filepath}. File may be too large for pandas.")
+        logging.error(f"MemoryError parsing Excel file {filepath}. File may be too large to load at once.")
     except Exception as e:
         logging.error(f"Unexpected error parsing Excel file {filepath}: {e}")
     return None
 
 def parse_html(filepath):
     """
-    Parses an HTML file (.html, .htm) using BeautifulSoup and extracts text content.
+    Parses an HTML file (.html, .htm) using selectolax (or lxml.html as fallback) and extracts text content.
     Returns the cleaned text as a single string, or None on error or if library missing.
     """
-    if not HAS_BS4:
-        logging.error("beautifulsoup4 and lxml libraries required for HTML parsing but not found.")
+    lexbor = _optional_import('selectolax.lexbor')
+    if lexbor is None and _optional_import('lxml.html') is None:
+        logging.error("selectolax or lxml library required for HTML parsing but not found. Install with: pip install selectolax")
         return None
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            # Use 'lxml' for speed and robustness; 'html.parser' is built-in but slower
-            soup = BeautifulSoup(f, 'lxml')
-
-        # Remove script and style elements
-        for element in soup(["script", "style"]):
-            element.decompose() # Remove the tag from the tree
-
-        # Get text, strip leading/trailing whitespace from lines, join non-empty lines
-        text = soup.get_text(separator='\n', strip=True)
+        data = _read_bytes(filepath) # Both parsers accept raw UTF-8 bytes
+        encoding = _detect_encoding_from_bytes(data[:_ENCODING_SNIFF_SIZE])
+        if encoding != 'utf-8':
+            data = data.decode(encoding, errors='replace').encode('utf-8')
+        if lexbor is not None:
+            tree = lexbor.LexborHTMLParser(data)
+
+            # Remove script and style elements
+            for node in tree.css('script,style'):
+                node.decompose()
+
+            # Get text from the whole document (including <title>); strip=True leaves
+            # empty pieces for whitespace-only nodes. Split on a separator that can't occur
+            # in text so blank lines inside a node (e.g. <pre>) survive
+            text = tree.root.text(separator='\x00', strip=True) if tree.root is not None else ""
+            text = "\n".join(piece for piece in text.split('\x00') if piece)
+        elif data.strip():
+            html_parser, drop_xpath = _lxml_html_tools()
+            tree = _optional_import('lxml.html').document_fromstring(data, parser=html_parser)
+
+            # Empty script and style elements; keep their tails, which belong to the parent
+            for bad in drop_xpath(tree):
+                bad.clear(keep_tail=True)
+
+            # Strip leading/trailing whitespace from text nodes, join non-empty ones
+            text = "\n".join(part for part in (chunk.strip() for chunk in tree.itertext()) if part)
+        else:
+            text = ""
 
         logging.info(f"Successfully parsed HTML and extracted text: {os.path.basename(filepath)}")
         # Optionally print snippet
@@ -327,58 +780,99 @@ def parse_html(filepath):
         logging.error(f"File not found: {filepath}")
     except IOError as e:
         logging.error(f"IOError reading HTML file {filepath}: {e}")
-    except Exception as e: # Catch potential BeautifulSoup errors
+    except Exception as e: # Catch potential parser errors
         logging.error(f"Error parsing HTML file {filepath}: {e}")
     return None
 
 # --- Main Parsing Dispatcher ---
 
+# Maps lowercase file extensions to their parser
+_PARSERS = {
+    '.txt': parse_txt,
+    '.csv': parse_csv,
+    '.json': parse_json,
+    '.xml': parse_xml,
+    '.pdf': parse_pdf,
+    '.docx': parse_docx,
+    '.xlsx': parse_excel,
+    '.xls': parse_excel,
+    '.html': parse_html,
+    '.htm': parse_html,
+}
+
+# Formats whose parsers return immutable text and can safely share cached results.
+# CSV/JSON/Excel results are mutable containers and are always parsed fresh.
+_CACHEABLE_EXTENSIONS = frozenset({'.txt', '.xml', '.pdf', '.docx', '.html', '.htm'})
+
+_PARSE_CACHE = collections.OrderedDict() # (abspath, mtime_ns, size) -> text, least recent first
+_PARSE_CACHE_SIZE = 128
+_PARSE_CACHE_LOCK = threading.Lock()
+
+def _parse_cached(filepath, parser, st):
+    """
+    Memoizes text parsers. mtime_ns and size are part of the key so edited files are re-parsed.
+    Failures (None) are not cached, so a transient error or a later-installed library recovers.
+    """
+    key = (os.path.abspath(filepath), st.st_mtime_ns, st.st_size)
+    with _PARSE_CACHE_LOCK:
+        if key in _PARSE_CACHE:
+            _PARSE_CACHE.move_to_end(key)
+            return _PARSE_CACHE[key]
+    content = parser(filepath)
+    if content is not None:
+        with _PARSE_CACHE_LOCK:
+            _PARSE_CACHE[key] = content
+            _PARSE_CACHE.move_to_end(key)
+            if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+                _PARSE_CACHE.popitem(last=False)
+    return content
+
 def parse_document(filepath):
     """
     Parses a document based on its file extension. Logs errors.
+    Text results are cached per (path, mtime, size), so re-parsing an unchanged file is free.
 
     Args:
         filepath (str): The path to the document file.
 
     Returns:
-        The parsed content in a format-specific type (str, list, dict, dict[str, pd.DataFrame]),
+        The parsed content in a format-specific type (str, list, dict, dict[str, list] for .xlsx,
+        dict[str, pd.DataFrame] for .xls),
         or None if the file doesn't exist, the format is unsupported, or parsing fails.
     """
     if not isinstance(filepath, str) or not filepath:
         logging.error("Invalid filepath provided.")
         return None
 
-    if not os.path.exists(filepath):
+    _, extension = os.path.splitext(filepath)
+    extension = extension.lower()
+
+    # Reject unsupported formats before touching the filesystem
+    parser = _PARSERS.get(extension)
+    if parser is None:
+        logging.warning(f"Unsupported file format '{extension}' for file: {filepath}")
+        logging.error(f"Failed to parse: {os.path.basename(filepath)}")
+        return None
+
+    # A single stat() answers both "exists" and "is a regular file"
+    try:
+        st = os.stat(filepath)
+    except FileNotFoundError:
         logging.error(f"File does not exist: {filepath}")
         return None
-    if not os.path.isfile(filepath):
+    except OSError as e:
+        logging.error(f"Cannot access file {filepath}: {e}")
+        return None
+    if not stat.S_ISREG(st.st_mode):
          logging.error(f"Path is not a file: {filepath}")
          return None
 
-    _, extension = os.path.splitext(filepath)
-    extension = extension.lower()
-
     logging.info(f"Attempting to parse file: {filepath} (Detected type: {extension})")
 
-    content = None
-    if extension == '.txt':
-        content = parse_txt(filepath)
-    elif extension == '.csv':
-        content = parse_csv(filepath)
-    elif extension == '.json':
-        content = parse_json(filepath)
-    elif extension == '.xml':
-        content = parse_xml(filepath)
-    elif extension == '.pdf':
-        content = parse_pdf(filepath)
-    elif extension == '.docx':
-        content = parse_docx(filepath)
-    elif extension in ['.xlsx', '.xls']:
-        content = parse_excel(filepath)
-    elif extension in ['.html', '.htm']:
-        content = parse_html(filepath)
+    if extension in _CACHEABLE_EXTENSIONS:
+        content = _parse_cached(filepath, parser, st)
     else:
-        logging.warning(f"Unsupported file format '{extension}' for file: {filepath}")
+        content = parser(filepath)
 
     if content is not None:
          logging.info(f"Finished parsing: {os.path.basename(filepath)}")
@@ -387,6 +881,25 @@ def parse_document(filepath):
 
     return content
 
+def parse_documents(filepaths, max_workers=None):
+    """
+    Parses many documents concurrently with a thread pool.
+    Most parsers spend their time in file I/O or native libraries that release the GIL.
+    PDFium calls are serialized across threads (it is not thread-safe); large PDFs
+    instead gain parallelism by fanning their pages out to a process pool inside parse_pdf.
+
+    Args:
+        filepaths (list[str]): Paths of the documents to parse.
+        max_workers (int, optional): Thread count. Defaults to min(32, cpu_count * 4).
+
+    Returns:
+        dict mapping each filepath to its parse_document result (None on failure).
+    """
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(filepaths, executor.map(parse_document, filepaths)))
+
 # --- Example Usage ---
 
 if __name__ == "__main__":
@@ -406,8 +919,8 @@ if __name__ == "__main__":
         # JSON
         with open("sample.json", "w", encoding='utf-8') as f: json.dump({"key": "value", "list": [1, None, True]}, f)
         dummy_files_created.append("sample.json")
-        # XML
-        with open("sample.xml", "w", encoding='utf-8') as f: f.write('<data><item name="A">1</item><item name="B">2</item></data>')
+        # XML (with a prolog PI and comment before the root element)
+        with open("sample.xml", "w", encoding='utf-8') as f: f.write('<?xml version="1.0"?><?xml-stylesheet href="a.xsl"?><!-- c --><data><item name="A">1</item><item name="B">2</item></data>')
         dummy_files_created.append("sample.xml")
         # HTML
         with open("sample.html", "w", encoding='utf-8') as f: f.write('<!DOCTYPE html><html><body><p>Hello</p><p>World</p></body></html>')
@@ -428,18 +941,16 @@ if __name__ == "__main__":
         # "path/to/your/document.docx",
         # "path/to/your/spreadsheet.xlsx",
         # ------------------------------------------
-        "non_existent_file.xyz" # Test file not found
+        "non_existent_file.txt", # Test file not found
+        "unsupported_file.xyz"   # Test unsupported format
     ]
 
-    results = {}
     print("\n" + "=" * 70)
     logging.info("Starting batch parsing...")
     print("=" * 70)
 
-    for file in files_to_parse:
-        parsed_data = parse_document(file)
-        results[file] = parsed_data
-        print("-" * 70) # Separator between file outputs
+    # Files are parsed concurrently, so their log lines may interleave
+    results = parse_documents(files_to_parse)
 
     logging.info("Batch parsing finished.")
     print("=" * 70)
@@ -458,6 +969,12 @@ if __name__ == "__main__":
     if json_data:
         logging.info(f"Value of 'key' in sample.json: {json_data.get('key')}")
 
+    xml_text = results.get("sample.xml")
+    if xml_text == "1 2":
+        logging.info(f"Text of sample.xml: '{xml_text}'")
+    else:
+        logging.error(f"Unexpected text from sample.xml: {xml_text!r} (expected '1 2')")
+
     # --- Clean up dummy files ---
     logging.info("Cleaning up dummy files...")
     cleaned_count = 0